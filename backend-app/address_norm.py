@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Address canonicalization and property keys, so notices on the same property can
+be joined with an indexed equality lookup instead of fuzzy string matching.
+
+  normalize_address("1203 North Charles Street, Apt. 2B")  ->  "1203 N CHARLES ST UNIT 2B"
+  property_key(...)                                          ->  16-hex-char hash of the above
+
+Rules: uppercase, punctuation dropped, whitespace collapsed; directions
+(NORTH/N., NE, ...) and street suffixes (STREET/STR/ST., AVENUE/AV, ...) reduced
+to USPS abbreviations, SAINT to ST; unit designators (APT, APARTMENT, UNIT, STE, #, ...,
+and REAR/FRONT/UPPER/LOWER/BSMT right after the street suffix) rewritten as "UNIT <id>"
+with the id's parts joined ("APT 1-A" -> "UNIT 1A", "2ND FL" -> "UNIT 2"); placeholder
+addresses such as "Unknown" normalize to "" and get no key. A direction is only abbreviated
+right after the house number or at the end, and a suffix only as the last street word, so
+street names like "NORTH AVE", "FRONT ST" or "PARK HEIGHTS AVE" keep their words.
+
+Usage:
+  python address_norm.py "1203 North Charles Street Apt 2B"
+  python address_norm.py --backfill        # fill violations.property_key where NULL (needs DB_URL)
+"""
+import hashlib, os, re, sys
+
+DIRECTIONS = {
+    "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW",
+    "N": "N", "S": "S", "E": "E", "W": "W", "NE": "NE", "NW": "NW", "SE": "SE", "SW": "SW",
+}
+SUFFIXES = {
+    "STREET": "ST", "STR": "ST", "ST": "ST",
+    "AVENUE": "AVE", "AVEN": "AVE", "AV": "AVE", "AVE": "AVE",
+    "ROAD": "RD", "RD": "RD",
+    "BOULEVARD": "BLVD", "BOUL": "BLVD", "BLVD": "BLVD",
+    "DRIVE": "DR", "DRV": "DR", "DR": "DR",
+    "LANE": "LN", "LN": "LN",
+    "COURT": "CT", "CT": "CT",
+    "PLACE": "PL", "PL": "PL",
+    "TERRACE": "TER", "TERR": "TER", "TER": "TER",
+    "CIRCLE": "CIR", "CIR": "CIR",
+    "PARKWAY": "PKWY", "PKY": "PKWY", "PKWY": "PKWY",
+    "HIGHWAY": "HWY", "HWY": "HWY",
+    "ALLEY": "ALY", "ALY": "ALY",
+    "SQUARE": "SQ", "SQ": "SQ",
+    "WAY": "WAY", "WY": "WAY",
+    "PIKE": "PIKE",
+}
+UNIT_WORDS = {"APT", "APARTMENT", "UNIT", "STE", "SUITE", "RM", "ROOM", "FL", "FLOOR", "BLDG", "BUILDING"}
+# "NO" is only a unit marker when a number follows ("APT NO 3", "NO 2"); otherwise it's a street word
+# designators that may trail their id ("2ND FL")
+UNIT_TRAILING = {"FL", "FLOOR"}
+# placeholders stored for rows without an address; these get no property key
+NO_ADDRESS = {"UNKNOWN", "N/A", "NA", "NONE"}
+# designators that stand alone without an id; only after a street suffix ("10 LIGHT ST REAR"),
+# since FRONT / UPPER / ... also start street names ("100 N FRONT ST", "12 UPPER PARK AVE")
+UNIT_BARE = {"REAR": "REAR", "FRNT": "FRONT", "FRONT": "FRONT", "BSMT": "BASEMENT", "BASEMENT": "BASEMENT",
+             "UPPR": "UPPER", "UPPER": "UPPER", "LOWR": "LOWER", "LOWER": "LOWER"}
+
+_PUNCT = re.compile(r"[^\w#\s-]")
+_ORDINAL = re.compile(r"^(\d+)(ST|ND|RD|TH)$")
+
+def _tokens(addr: str):
+    s = _PUNCT.sub(" ", (addr or "").upper())
+    s = re.sub(r"#\s*", " # ", s)
+    # "1203-1205" stays one house-number token; a dash anywhere else is a separator
+    s = re.sub(r"(?<!\d)-|-(?!\d)", " ", s)
+    return s.split()
+
+def normalize_address(addr: str) -> str:
+    if (addr or "").strip().upper() in NO_ADDRESS: return ""
+    toks = _tokens(addr)
+    if not toks: return ""
+
+    def is_marker(i):
+        t = toks[i]
+        if t == "NO": return i + 1 < len(toks) and toks[i+1][:1].isdigit()
+        return t in UNIT_WORDS or t == "#"
+
+    # split off the unit part at the first designator
+    unit = []
+    for i, t in enumerate(toks):
+        if i == 0: continue
+        if is_marker(i):
+            # the id is joined without separators so "1-A", "1 A" and "#1A" all become "1A"
+            ident = "".join(x for x in toks[i+1:] if x not in UNIT_WORDS and x not in ("#", "NO")).replace("-", "")
+            if not ident and t in UNIT_TRAILING and i > 1 and toks[i-1][:1].isdigit():
+                ident = toks[i-1]; i -= 1
+            ident = _ORDINAL.sub(r"\1", ident)  # "2ND FL" == "FLOOR 2"
+            unit = ["UNIT", ident] if ident else []
+            toks = toks[:i]; break
+        if t in UNIT_BARE and i > 1 and toks[i-1] in SUFFIXES:
+            unit = ["UNIT", UNIT_BARE[t], *toks[i+1:]]
+            toks = toks[:i]; break
+
+    out = list(toks)
+    has_number = bool(out) and out[0][:1].isdigit()
+    street_start = 1 if has_number else 0
+    # leading direction (after the house number), unless it *is* the street name ("1200 NORTH AVE")
+    if len(out) > street_start + 2 and out[street_start] in DIRECTIONS:
+        out[street_start] = DIRECTIONS[out[street_start]]
+    # trailing direction ("... ST NW")
+    if len(out) > street_start + 2 and out[-1] in DIRECTIONS and out[-2] in SUFFIXES:
+        out[-1] = DIRECTIONS[out[-1]]
+        out[-2] = SUFFIXES[out[-2]]
+    elif len(out) > street_start + 1 and out[-1] in SUFFIXES:
+        out[-1] = SUFFIXES[out[-1]]
+    # "SAINT PAUL ST" and "ST PAUL ST" are the same street
+    for i in range(street_start, len(out) - 1):
+        if out[i] == "SAINT": out[i] = "ST"
+    return " ".join(out + unit)
+
+def property_key(addr: str) -> str:
+    """Stable 64-bit hex key of the normalized address ("" for an empty address)."""
+    norm = normalize_address(addr)
+    return hashlib.blake2b(norm.encode("utf-8"), digest_size=8).hexdigest() if norm else ""
+
+def backfill_postgres(db_url: str, batch: int = 1000) -> int:
+    """Compute address_normalized/property_key for rows written before the columns existed."""
+    import psycopg2
+    from psycopg2.extras import execute_values
+    done, last = 0, ""
+    with psycopg2.connect(db_url) as conn:
+        while True:
+            with conn.cursor() as cur:
+                # keyset paging: rows without a usable address stay NULL (as the scraper stores
+                # them) and must not be selected again
+                cur.execute("""SELECT notice_number, address FROM violations
+                                WHERE property_key IS NULL AND notice_number > %s
+                                ORDER BY notice_number LIMIT %s""", (last, batch))
+                rows = cur.fetchall()
+                if not rows: break
+                last = rows[-1][0]
+                updates = [(n, normalize_address(a), property_key(a)) for n, a in rows]
+                updates = [u for u in updates if u[2]]  # 'Unknown' / empty: no key, never a repeat offender
+                if updates:
+                    execute_values(cur, """
+                        UPDATE violations AS v SET address_normalized = d.norm, property_key = d.pkey
+                          FROM (VALUES %s) AS d(notice_number, norm, pkey)
+                         WHERE v.notice_number = d.notice_number
+                    """, updates)
+            conn.commit()
+            done += len(updates)
+            print(f"[info] backfilled {done} rows")
+    return done
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--backfill"]:
+        db_url = os.getenv("DB_URL")
+        if not db_url: print("[error] DB_URL is not set"); sys.exit(1)
+        backfill_postgres(db_url)
+        sys.exit(0)
+    for a in sys.argv[1:]:
+        print(f"{normalize_address(a)}\t{property_key(a)}")
@@ -1,40 +1,108 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-import asyncio, csv, os, re, json, sys
+import asyncio, csv, importlib, os, re, json, sys, tempfile, time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Tuple
 
 from playwright.async_api import async_playwright, TimeoutError as PWTimeout
 
-try:
-    import psycopg2
-    from psycopg2.extras import execute_values
-except ImportError:
-    psycopg2 = None
-
-try:
-    import pdfplumber
-except Exception:
-    pdfplumber = None
-try:
-    import ocrmypdf
-except Exception:
-    ocrmypdf = None
+import event_stream
+from address_norm import normalize_address, property_key
+from event_stream import emit
+from packed_store import PackedStore
+
+# psycopg2, pdfplumber and ocrmypdf are optional and only needed with DB_URL / --extract / --ocr,
+# so they are imported on first use; ocrmypdf alone pulls in a large dependency tree.
+# `python bench_import_time.py` shows what module load costs.
+@lru_cache(maxsize=None)
+def _optional_import(name: str):
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        return None
 
 SEARCH_URL = "https://cels.baltimorehousing.org/Search_On_Map.aspx"
 SENTINEL_NEIGHBORHOODS = [
     "ABELL","ALLENDALE","ARCADIA","BALTIMORE HIGHLANDS","BARCLAY","CANTON",
     "CHARLES VILLAGE","FEDERAL HILL","HAMPDEN","HIGHLANDTOWN","MOUNT VERNON",
 ]
+# Latency budget (ms) per step; each wait below is event-driven and gives up after its budget.
+STEP_BUDGET_MS = {
+    "goto": 60000,        # initial/search page navigation
+    "form": 20000,        # search form <select> attached
+    "results": 10000,     # results table visible
+    "download": 15000,    # download event after click
+    "popup": 15000,       # new tab opened after click
+    "pdf_response": 25000,# PDF response on the new tab / navigation
+    "popup_url": 20000,   # new tab committed to a real http(s) URL
+    "navigate": 20000,    # same-tab navigation committed after click
+    "fetch": 25000,       # direct GET of a PDF URL
+    "restore": 8000,      # back to the results table after navigate path
+}
 
 def norm_ws(s: str) -> str: return " ".join((s or "").split())
 
+def apply_probe_report(path: Path) -> dict:
+    """Load `test_site_connectivity.py --probe` output and adopt its recommended step budgets.
+
+    Returns the report's "recommended" block (row_timeout_sec, workers) for the caller to apply.
+    """
+    rec = (json.loads(Path(path).read_text(encoding="utf-8")).get("recommended") or {})
+    budgets = {k: int(v) for k, v in (rec.get("step_budget_ms") or {}).items() if k in STEP_BUDGET_MS and v}
+    STEP_BUDGET_MS.update(budgets)
+    print(f"[info] Tuned from {path}: {len(budgets)} step budgets, row_timeout={rec.get('row_timeout_sec')}, workers={rec.get('workers')}")
+    return rec
+
+# ---------- browser ----------
+async def new_browser_context(browser):
+    """A fresh context (own cookies, so its own ASP.NET session) with the stealth settings.
+
+    TL_On_Map.aspx renders results from server-side session state, so concurrent workers
+    must not share a context: they'd be serialized per session and could see each
+    other's neighborhood after go_back/reload.
+    """
+    context = await browser.new_context(
+        accept_downloads=True,
+        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        viewport={"width": 1440, "height": 900},
+        # Additional stealth settings
+        locale="en-US",
+        timezone_id="America/New_York",
+        permissions=["geolocation"],
+        extra_http_headers={
+            "Accept-Language": "en-US,en;q=0.9",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Encoding": "gzip, deflate, br",
+            "DNT": "1",
+            "Connection": "keep-alive",
+            "Upgrade-Insecure-Requests": "1"
+        }
+    )
+    # Mask automation indicators
+    await context.add_init_script("""
+        Object.defineProperty(navigator, 'webdriver', {
+            get: () => undefined
+        });
+        Object.defineProperty(navigator, 'plugins', {
+            get: () => [1, 2, 3, 4, 5]
+        });
+        Object.defineProperty(navigator, 'languages', {
+            get: () => ['en-US', 'en']
+        });
+        window.chrome = { runtime: {} };
+    """)
+    return context
+
 # ---------- database helpers ----------
 def get_db_connection():
     """Get PostgreSQL connection from environment variable DB_URL"""
     db_url = os.getenv("DB_URL")
-    if not db_url or psycopg2 is None:
+    if not db_url:
+        return None
+    psycopg2 = _optional_import("psycopg2")
+    if psycopg2 is None:
         return None
     try:
         return psycopg2.connect(db_url)
@@ -52,9 +120,10 @@ def upsert_violation(conn, violation: dict) -> bool:
             cur.execute("""
                 INSERT INTO violations (
                     notice_number, address, type, district, neighborhood,
-                    date_notice, pdf_url, text_url, created_at, updated_at
+                    date_notice, pdf_url, text_url, address_normalized, property_key,
+                    created_at, updated_at
                 )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW())
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW())
                 ON CONFLICT (notice_number) 
                 DO UPDATE SET
                     address = EXCLUDED.address,
@@ -64,6 +133,8 @@ def upsert_violation(conn, violation: dict) -> bool:
                     date_notice = EXCLUDED.date_notice,
                     pdf_url = EXCLUDED.pdf_url,
                     text_url = EXCLUDED.text_url,
+                    address_normalized = EXCLUDED.address_normalized,
+                    property_key = EXCLUDED.property_key,
                     updated_at = NOW()
             """, (
                 violation['notice_number'],
@@ -73,7 +144,9 @@ def upsert_violation(conn, violation: dict) -> bool:
                 violation['neighborhood'],
                 violation['date_notice'],
                 violation.get('pdf_url'),
-                violation.get('text_url')
+                violation.get('text_url'),
+                violation.get('address_normalized'),
+                violation.get('property_key')
             ))
         conn.commit()
         return True
@@ -108,16 +181,49 @@ async def _find_neighborhood_select_by_options(page):
             return sel
     return None
 
+# Resolved selectors for the search form, cached for the session; see get_neighborhood_controls.
+_controls_cache: dict = {}
+
+_STABLE_SELECTOR_JS = """(el) => {
+    const tag = el.tagName.toLowerCase();
+    if (el.id) return tag + '#' + CSS.escape(el.id);
+    if (el.name) return tag + '[name="' + el.name.replace(/"/g, '\\\\"') + '"]';
+    return null;
+}"""
+
+async def _cached_neighborhood_controls(page):
+    """Resolve the controls from the cached selectors; None if the page no longer matches them."""
+    if not _controls_cache: return None
+    try:
+        sel = page.locator(_controls_cache["select"])
+        cb = page.locator(_controls_cache["checkbox"])
+        if await sel.count() != 1 or await cb.count() != 1: return None
+        if not await sel.is_visible() and _controls_cache.get("trigger"):
+            await page.locator(_controls_cache["trigger"]).first.click(timeout=1000)
+        if not await sel.is_visible(): return None
+        if (await sel.evaluate("(el)=>el.options.length") or 0) < 50: return None
+        return cb, sel
+    except Exception:
+        return None
+
 async def get_neighborhood_controls(page):
     try:
-        await page.locator("select").first.wait_for(state="attached", timeout=20000)
+        await page.locator("select").first.wait_for(state="attached", timeout=STEP_BUDGET_MS["form"])
     except PWTimeout:
         pass
-    for trigger in ["By Neighborhood", "Neighborhood"]:
-        for locator in [f"xpath=//label[contains(normalize-space(.), '{trigger}')]", f"text={trigger}"]:
+    cached = await _cached_neighborhood_controls(page)
+    if cached: return cached
+    if _controls_cache:
+        print("[warn] Cached search-form selectors no longer match; rediscovering.")
+        _controls_cache.clear()
+    trigger = None
+    for label in ["By Neighborhood", "Neighborhood"]:
+        for locator in [f"xpath=//label[contains(normalize-space(.), '{label}')]", f"text={label}"]:
             try:
                 el = page.locator(locator)
-                if await el.count(): await el.first.click(timeout=1000)
+                if await el.count():
+                    await el.first.click(timeout=1000)
+                    trigger = trigger or locator
             except Exception: pass
     sel = await _find_neighborhood_select_by_options(page)
     if sel is None:
@@ -136,8 +242,31 @@ async def get_neighborhood_controls(page):
             "xpath=//input[@type='checkbox' and (contains(@id,'Neigh') or contains(@name,'Neigh') or contains(@id,'Neighborhood') or contains(@name,'Neighborhood'))]"
         ).first
     await cb.wait_for(state="attached", timeout=10000)
+    # Cache only when both controls have an id/name; positional matches aren't stable across loads.
+    try:
+        sel_css = await sel.evaluate(_STABLE_SELECTOR_JS)
+        cb_css = await cb.evaluate(_STABLE_SELECTOR_JS)
+        if sel_css and cb_css:
+            _controls_cache.update(select=sel_css, checkbox=cb_css, trigger=trigger)
+    except Exception:
+        pass
     return cb, sel
 
+async def return_to_search_form(page) -> bool:
+    """Step back from the results page to the search form (bfcache) instead of reloading it.
+
+    Returns False when the form can't be reused; the caller should then goto(SEARCH_URL).
+    """
+    if not _controls_cache: return False
+    for _ in range(3):
+        if re.search(r"Search_On_Map\.aspx", page.url or "", re.I): break
+        try: await page.go_back(wait_until="domcontentloaded", timeout=STEP_BUDGET_MS["restore"])
+        except Exception: return False
+        if page.url in ("", "about:blank"): return False
+    else:
+        return False
+    return await _cached_neighborhood_controls(page) is not None
+
 async def get_neighborhood_options(page) -> List[str]:
     _, select = await get_neighborhood_controls(page)
     return await select.evaluate("(el)=>Array.from(el.options).map(o=>o.text.trim()).filter(Boolean)")
@@ -157,15 +286,14 @@ async def submit_search_for_neighborhood(page, neighborhood: str):
         submit = page.locator("xpath=//input[@type='submit' and (contains(@value,'Search') or contains(@name,'Search'))]")
         if await submit.count(): await submit.first.click()
         else: await page.locator("button, input[type=submit]").first.click()
-    try: await page.wait_for_url(re.compile(r"TL_On_Map\.aspx"), timeout=30000)
-    except PWTimeout: pass
-    await page.wait_for_load_state("domcontentloaded")
+    try: await page.wait_for_url(re.compile(r"TL_On_Map\.aspx"), wait_until="domcontentloaded", timeout=30000)
+    except PWTimeout: await page.wait_for_load_state("domcontentloaded")
 
 async def find_results_table(page):
     table = page.locator("table").nth(1)
     if await table.count() == 0 or await table.locator("tr").count() <= 1:
         table = page.locator("text=Record Count").locator("xpath=..").locator("xpath=following::table[1]")
-    await table.wait_for(state="visible", timeout=10000)
+    await table.wait_for(state="visible", timeout=STEP_BUDGET_MS["results"])
     return table
 
 async def extract_rows_on_results(page) -> List[Tuple[str,str,str,str,str,str]]:
@@ -185,17 +313,33 @@ async def extract_rows_on_results(page) -> List[Tuple[str,str,str,str,str,str]]:
     return out
 
 # ---------- pdf helpers ----------
+def _is_pdf_response(r) -> bool:
+    return "pdf" in (r.headers.get("content-type","").lower())
+
 async def _wait_pdf_response(new_page):
     try:
-        return await new_page.wait_for_event(
-            "response", lambda r: "pdf" in (r.headers.get("content-type","").lower()), timeout=25000
-        )
+        return await new_page.wait_for_event("response", _is_pdf_response, timeout=STEP_BUDGET_MS["pdf_response"])
     except PWTimeout:
         return None
 
+async def _fetch_pdf(context, url: str, dest_path: Path) -> bool:
+    try:
+        r = await context.request.get(url, timeout=STEP_BUDGET_MS["fetch"])
+        ctype = (r.headers or {}).get("content-type","")
+        if "pdf" in ctype.lower() or url.lower().endswith(".pdf"):
+            data = await r.body()
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            dest_path.write_bytes(data)
+            return True
+    except Exception:
+        pass
+    return False
+
+# New tabs are captured with the page's own "popup" event rather than the shared context's
+# "page" event, so with --workers > 1 a worker never claims a tab opened by another worker.
 async def _save_pdf_via_popup(context, page, click_callable, dest_path: Path) -> bool:
     try:
-        async with context.expect_page(timeout=15000) as pinfo:
+        async with page.expect_popup(timeout=STEP_BUDGET_MS["popup"]) as pinfo:
             await click_callable()
         new_page = await pinfo.value
         resp = await _wait_pdf_response(new_page)
@@ -205,33 +349,32 @@ async def _save_pdf_via_popup(context, page, click_callable, dest_path: Path) ->
             dest_path.write_bytes(data)
             await new_page.close()
             return True
-        # fallback: try direct GET of the new tab URL
-        for _ in range(40):
-            url = new_page.url or ""
-            if url.startswith(("http://","https://")):
-                try:
-                    r = await context.request.get(url, timeout=25000)
-                    ctype = (r.headers or {}).get("content-type","")
-                    if "pdf" in ctype.lower() or url.lower().endswith(".pdf"):
-                        data = await r.body()
-                        dest_path.parent.mkdir(parents=True, exist_ok=True)
-                        dest_path.write_bytes(data)
-                        await new_page.close()
-                        return True
-                except Exception:
-                    pass
-                break
-            await asyncio.sleep(0.5)
+        # fallback: wait for the new tab to commit to a real URL, then GET it directly
+        try:
+            await new_page.wait_for_url(re.compile(r"^https?://"), wait_until="commit", timeout=STEP_BUDGET_MS["popup_url"])
+            ok = await _fetch_pdf(context, new_page.url, dest_path)
+        except PWTimeout:
+            ok = False
         await new_page.close()
-        return False
+        return ok
     except PWTimeout:
         return False
 
 async def _save_pdf_via_download(page, click_callable, dest_path: Path) -> bool:
+    # Race the download against a new tab: if the click opens a tab instead, bail out
+    # immediately rather than sitting out the whole download budget.
+    budget = STEP_BUDGET_MS["download"]
+    dl_task = asyncio.ensure_future(page.wait_for_event("download", timeout=budget))
+    tab_task = asyncio.ensure_future(page.wait_for_event("popup", timeout=budget))
     try:
-        async with page.expect_download(timeout=15000) as dl_info:
-            await click_callable()
-        download = await dl_info.value
+        await click_callable()
+        done, _ = await asyncio.wait({dl_task, tab_task}, return_when=asyncio.FIRST_COMPLETED)
+        if dl_task not in done or dl_task.exception():
+            if tab_task in done and not tab_task.exception():
+                try: await tab_task.result().close()
+                except Exception: pass
+            return False
+        download = dl_task.result()
         suggested = download.suggested_filename
         dest = dest_path.with_name(suggested) if suggested and suggested.lower().endswith(".pdf") else dest_path.with_suffix(".pdf")
         dest.parent.mkdir(parents=True, exist_ok=True)
@@ -239,43 +382,57 @@ async def _save_pdf_via_download(page, click_callable, dest_path: Path) -> bool:
         return True
     except PWTimeout:
         return False
+    finally:
+        for t in (dl_task, tab_task):
+            if not t.done(): t.cancel()
+            elif not t.cancelled(): t.exception()  # mark retrieved so asyncio does not warn
+
+async def _restore_results(page, results_url: str):
+    """Return to the results table after a same-tab navigation, preferring history (bfcache) over a reload."""
+    if page.url == results_url: return
+    try:
+        await page.go_back(wait_until="commit", timeout=STEP_BUDGET_MS["restore"])
+        await page.locator("table").nth(1).wait_for(state="visible", timeout=STEP_BUDGET_MS["restore"])
+    except Exception:
+        pass
 
 async def _save_pdf_via_navigation(context, page, click_callable, dest_path: Path) -> bool:
+    results_url = page.url
     try:
-        async with page.expect_navigation(timeout=20000):
+        async with page.expect_navigation(wait_until="commit", timeout=STEP_BUDGET_MS["navigate"]) as ninfo:
             await click_callable()
+        resp = await ninfo.value
     except PWTimeout:
         return False
     url = page.url or ""
-    if not url.startswith(("http://","https://")):
-        try: await page.go_back(timeout=8000)
-        except Exception: pass
-        return False
-    try:
-        r = await context.request.get(url, timeout=25000)
-        if "pdf" in (r.headers or {}).get("content-type","").lower() or url.lower().endswith(".pdf"):
-            data = await r.body()
+    ok = False
+    if resp is not None and _is_pdf_response(resp):
+        # the navigation itself carried the PDF; reuse its body instead of a second GET
+        try:
+            data = await resp.body()
             dest_path.parent.mkdir(parents=True, exist_ok=True)
             dest_path.write_bytes(data)
-            try: await page.go_back(timeout=8000)
-            except Exception: pass
-            return True
-    except Exception:
-        pass
-    try: await page.go_back(timeout=8000)
-    except Exception: pass
-    return False
+            ok = True
+        except Exception:
+            pass
+    if not ok and url.startswith(("http://","https://")):
+        ok = await _fetch_pdf(context, url, dest_path)
+    await _restore_results(page, results_url)
+    return ok
 
 async def download_all_pdfs_for_results(page, out_dir: Path, rows: List[Tuple[str,str,str,str,str,str]], *,
                                         after_download=None, max_pdfs: Optional[int]=None,
-                                        skip_existing: bool=False, row_timeout_sec: int=45) -> int:
+                                        skip_existing: bool=False, row_timeout_sec: int=45,
+                                        timings: Optional[List[float]]=None, neighborhood: str="",
+                                        max_rows: Optional[int]=None, row_pause_ms: int=0) -> int:
     out_dir.mkdir(parents=True, exist_ok=True)
     table = await find_results_table(page)
     trs = table.locator("tr")
     total = await trs.count() - 1
+    if max_rows is not None: total = min(total, max_rows)
     downloaded = 0
 
-    for i in range(1, await trs.count()):
+    for i in range(1, total + 1):
         row = trs.nth(i)
         human_i = f"{i}/{total}"
         notice = (rows[i-1][3] if i-1 < len(rows) else "").strip().replace("/", "-").replace("\\","-")
@@ -285,6 +442,7 @@ async def download_all_pdfs_for_results(page, out_dir: Path, rows: List[Tuple[st
 
         if skip_existing and dest.exists():
             print(f"[row] {human_i} skip (exists)")
+            await emit("row_skipped", neighborhood=neighborhood, notice_number=notice, reason="exists", path=str(dest))
             if after_download:
                 try:
                     await after_download(dest, i-1, rows[i-1] if i-1 < len(rows) else None)
@@ -292,9 +450,10 @@ async def download_all_pdfs_for_results(page, out_dir: Path, rows: List[Tuple[st
                     pass
             continue
 
+        t0 = time.perf_counter()
         cell = row.locator("td").last
         cands = [cell.locator("a"), cell.locator("input[type=image]"), cell.locator("img[onclick]"), cell.locator("img")]
-        got = False
+        got = ""  # name of the click path that produced the PDF
 
         async def _try_all_click_paths():
             nonlocal got
@@ -311,30 +470,41 @@ async def download_all_pdfs_for_results(page, out_dir: Path, rows: List[Tuple[st
                     async def click_middle(): await elem.click(button="middle")
                     async def click_ctrl():   await elem.click(modifiers=["Control"])
                     async def click_plain():  await elem.click()
-                    if await _save_pdf_via_download(page, click_middle, dest): print(f"[row] {human_i} path=download"); got = True; return
-                    if await _save_pdf_via_popup(page.context, page, click_ctrl, dest): print(f"[row] {human_i} path=popup"); got = True; return
-                    if await _save_pdf_via_navigation(page.context, page, click_plain, dest): print(f"[row] {human_i} path=navigate"); got = True; return
+                    if await _save_pdf_via_download(page, click_middle, dest): print(f"[row] {human_i} path=download"); got = "download"; return
+                    if await _save_pdf_via_popup(page.context, page, click_ctrl, dest): print(f"[row] {human_i} path=popup"); got = "popup"; return
+                    if await _save_pdf_via_navigation(page.context, page, click_plain, dest): print(f"[row] {human_i} path=navigate"); got = "navigate"; return
 
         try:
             await asyncio.wait_for(_try_all_click_paths(), timeout=row_timeout_sec)
         except asyncio.TimeoutError:
             print(f"[row] {human_i} timeout after {row_timeout_sec}s")
+        dt = time.perf_counter() - t0
+        if timings is not None: timings.append(dt)
 
         if got:
             downloaded += 1
+            await emit("pdf_saved", neighborhood=neighborhood, notice_number=notice, path=str(dest), method=got,
+                       bytes=dest.stat().st_size if dest.exists() else None, duration_ms=round(dt * 1000))
             if after_download:
                 try: await after_download(dest, i-1, rows[i-1] if i-1 < len(rows) else None)
                 except Exception: pass
         else:
             print(f"[row] {human_i} no-pdf")
+            await emit("pdf_failed", neighborhood=neighborhood, notice_number=notice, duration_ms=round(dt * 1000),
+                       reason="timeout" if dt >= row_timeout_sec else "no-pdf")
+        print(f"[row] {human_i} took {dt:.2f}s")
 
         if max_pdfs and downloaded >= max_pdfs: break
-        await page.wait_for_timeout(500)
+        # next row is ready as soon as the results table is back; pause only if asked (--slow-mo)
+        try: await table.wait_for(state="visible", timeout=STEP_BUDGET_MS["results"])
+        except PWTimeout: pass
+        if row_pause_ms: await page.wait_for_timeout(row_pause_ms)
 
     return downloaded
 
 # ---------- extraction ----------
 def _extract_text(pdf_path: Path) -> str:
+    pdfplumber = _optional_import("pdfplumber")
     if pdfplumber is None: return ""
     try:
         with pdfplumber.open(pdf_path) as pdf:
@@ -343,6 +513,7 @@ def _extract_text(pdf_path: Path) -> str:
         return ""
 
 def _ocr_pdf(in_path: Path, out_path: Path) -> bool:
+    ocrmypdf = _optional_import("ocrmypdf")
     if ocrmypdf is None: return False
     try:
         ocrmypdf.ocr(input_file=str(in_path), output_file=str(out_path),
@@ -359,23 +530,34 @@ def _parse_fields_from_text(text: str) -> dict:
     if m: fields["date_notice_from_pdf"] = m.group(1)
     return fields
 
-async def make_after_download(out_root: Path, nhood: str, do_extract: bool, do_ocr: bool, force_extract: bool):
+async def make_after_download(out_root: Path, nhood: str, do_extract: bool, do_ocr: bool, force_extract: bool,
+                              store: Optional[PackedStore] = None):
     text_root = out_root / "text" / nhood
     json_root = out_root / "json" / nhood
     ocr_root  = out_root / "ocr"  / nhood
-    for d in (text_root, json_root, ocr_root): d.mkdir(parents=True, exist_ok=True)
+    if store is None:
+        for d in (text_root, json_root, ocr_root): d.mkdir(parents=True, exist_ok=True)
 
     async def _after(pdf_path: Path, row_idx: int, row: Tuple[str,str,str,str,str,str] | None):
         if not do_extract: return
+        notice = (row[3] if row else "") or pdf_path.stem
         txt_path = text_root / (pdf_path.stem + ".txt")
         json_path = json_root / (pdf_path.stem + ".json")
-        if not force_extract and txt_path.exists() and json_path.exists():
-            return
+        if not force_extract:
+            if store is not None and store.has(nhood, notice): return
+            if store is None and txt_path.exists() and json_path.exists(): return
+        t0 = time.perf_counter()
         text = _extract_text(pdf_path)
-        if do_ocr and len(text) < 50:
-            ocr_path = ocr_root / pdf_path.name
-            if _ocr_pdf(pdf_path, ocr_path): text = _extract_text(ocr_path)
-        txt_path.write_text(text, encoding="utf-8")
+        ocr_used = do_ocr and len(text) < 50
+        if ocr_used:
+            if store is None:
+                ocr_path = ocr_root / pdf_path.name
+                if _ocr_pdf(pdf_path, ocr_path): text = _extract_text(ocr_path)
+            else:
+                # packed mode keeps no OCR copy on disk
+                with tempfile.TemporaryDirectory() as tmp:
+                    ocr_path = Path(tmp) / pdf_path.name
+                    if _ocr_pdf(pdf_path, ocr_path): text = _extract_text(ocr_path)
         payload = {
             "source_pdf": str(pdf_path),
             "neighborhood": nhood,
@@ -386,11 +568,20 @@ async def make_after_download(out_root: Path, nhood: str, do_extract: bool, do_o
                 "notice_number": row[3] if row else "",
                 "district": row[4] if row else "",
                 "neighborhood_cell": row[5] if row else "",
+                "address_normalized": normalize_address(row[0]) if row else "",
+                "property_key": property_key(row[0]) if row else "",
             },
             "extracted_fields": _parse_fields_from_text(text),
             "has_text": bool(text),
         }
-        json_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        if store is not None:
+            store.append(nhood, {"notice_number": notice, **payload, "text": text})
+        else:
+            txt_path.write_text(text, encoding="utf-8")
+            json_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        await emit("extracted", neighborhood=nhood, notice_number=notice, chars=len(text), ocr=ocr_used,
+                   fields=payload["extracted_fields"], text_path=store.ref(nhood, notice) if store is not None else str(txt_path),
+                   duration_ms=round((time.perf_counter() - t0) * 1000))
     return _after
 
 # ---------- orchestration ----------
@@ -405,10 +596,14 @@ async def run(all_neighborhoods: bool,
               do_ocr: bool = False,
               skip_existing: bool = False,
               force_extract: bool = False,
-              row_timeout_sec: int = 12):
+              row_timeout_sec: int = 12,
+              store_kind: str = "files",
+              packed_codec: str = "gzip",
+              workers: int = 1):
 
     out_dir.mkdir(parents=True, exist_ok=True)
     csv_path = out_dir / "violations.csv"
+    store = PackedStore(out_dir, codec=packed_codec) if store_kind == "packed" else None
 
     # Initialize database connection
     db_conn = get_db_connection()
@@ -442,6 +637,10 @@ async def run(all_neighborhoods: bool,
             print(f"[warn] 'since' value {since!r} not ISO-date (YYYY-MM-DD). Ignoring.")
             since_date = None
 
+    # warm the extract/OCR imports in a thread while the browser starts, not on the first PDF
+    warmups = [asyncio.create_task(asyncio.to_thread(_optional_import, m))
+               for m, on in (("pdfplumber", do_extract), ("ocrmypdf", do_extract and do_ocr)) if on]
+
     async with async_playwright() as p:
         # Use new headless mode which is much harder to detect
         # Also add stealth args to avoid detection
@@ -460,46 +659,22 @@ async def run(all_neighborhoods: bool,
             headless=headless,
             args=launch_args
         )
-        context = await browser.new_context(
-            accept_downloads=True,
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            viewport={"width": 1440, "height": 900},
-            # Additional stealth settings
-            locale="en-US",
-            timezone_id="America/New_York",
-            permissions=["geolocation"],
-            extra_http_headers={
-                "Accept-Language": "en-US,en;q=0.9",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Encoding": "gzip, deflate, br",
-                "DNT": "1",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1"
-            }
-        )
-        # Mask automation indicators
-        await context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5]
-            });
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['en-US', 'en']
-            });
-            window.chrome = { runtime: {} };
-        """)
-        page = await context.new_page()
-        page.set_default_timeout(20000)  # Increased timeout for slow-loading elements
-        page.set_default_navigation_timeout(30000)  # Increased navigation timeout
-
-        async def goto(url: str):
-            await page.goto(url, timeout=60000)
-            await page.wait_for_load_state("domcontentloaded")
+        context = await new_browser_context(browser)
+        async def new_page(ctx=None):
+            pg = await (ctx or context).new_page()
+            pg.set_default_timeout(20000)  # Increased timeout for slow-loading elements
+            pg.set_default_navigation_timeout(30000)  # Increased navigation timeout
+            return pg
+
+        async def goto(page, url: str):
+            # domcontentloaded + the form's <select> is all we need; don't wait on the load event
+            await page.goto(url, wait_until="domcontentloaded", timeout=STEP_BUDGET_MS["goto"])
+            try: await page.locator("select").first.wait_for(state="attached", timeout=STEP_BUDGET_MS["form"])
+            except PWTimeout: pass
             if slow_mo_ms: await page.wait_for_timeout(slow_mo_ms)
 
-        await goto(SEARCH_URL); await page.wait_for_timeout(300)
+        page = await new_page()
+        await goto(page, SEARCH_URL)
 
         all_options = await get_neighborhood_options(page)
         if all_neighborhoods:
@@ -513,17 +688,25 @@ async def run(all_neighborhoods: bool,
                 else: print(f"[warn] Neighborhood {n!r} not found in options; skipping.")
             if not targets:
                 print("[error] No valid neighborhoods selected.")
+                await emit("run_done", ok=False, error="no valid neighborhoods")
                 await browser.close(); csv_file.close(); return
+        await emit("run_start", neighborhoods=targets, out=str(out_dir), since=since, extract=do_extract, store=store_kind)
 
-        for nhood in targets:
+        async def scrape_neighborhood(page, nhood: str):
             print(f"\n=== {nhood} ===")
-            await goto(SEARCH_URL); await page.wait_for_timeout(250)
+            await emit("neighborhood_start", neighborhood=nhood)
+            if not await return_to_search_form(page):
+                await goto(page, SEARCH_URL)
 
             try: await submit_search_for_neighborhood(page, nhood)
-            except PWTimeout: print(f"[warn] Timeout submitting search for {nhood}; skipping."); continue
+            except PWTimeout:
+                print(f"[warn] Timeout submitting search for {nhood}; skipping.")
+                await emit("neighborhood_done", neighborhood=nhood, ok=False, error="search timeout"); return
 
             try: rows = await extract_rows_on_results(page)
-            except PWTimeout: print(f"[warn] Could not find results table for {nhood}; skipping."); continue
+            except PWTimeout:
+                print(f"[warn] Could not find results table for {nhood}; skipping.")
+                await emit("neighborhood_done", neighborhood=nhood, ok=False, error="no results table"); return
 
             filtered = []
             for r in rows:
@@ -536,16 +719,22 @@ async def run(all_neighborhoods: bool,
                 filtered.append(r)
 
             print(f"[info] Found {len(filtered)} rows for {nhood}.")
+            await emit("rows_listed", neighborhood=nhood, count=len(filtered), total=len(rows))
+            for addr, typ, date_notice, notice_num, district, neighborhood in filtered:
+                await emit("row_listed", neighborhood=nhood, notice_number=notice_num, address=addr, type=typ,
+                           date_notice=date_notice, district=district, neighborhood_cell=neighborhood)
             pdf_dir  = out_dir / "pdf"  / nhood.replace("/", "-")
             txt_root = out_dir / "text" / nhood.replace("/", "-")
 
-            after = await make_after_download(out_dir, nhood, do_extract, do_ocr, force_extract)
+            after = await make_after_download(out_dir, nhood, do_extract, do_ocr, force_extract, store=store)
             downloaded = await download_all_pdfs_for_results(
                 page, pdf_dir, filtered,
                 after_download=after,
                 max_pdfs=max_pdfs_per_neighborhood,
                 skip_existing=skip_existing,
-                row_timeout_sec=row_timeout_sec
+                row_timeout_sec=row_timeout_sec,
+                neighborhood=nhood,
+                row_pause_ms=slow_mo_ms
             )
             print(f"[info] Downloaded {downloaded} PDFs for {nhood}.")
 
@@ -559,16 +748,22 @@ async def run(all_neighborhoods: bool,
                     continue
                 pdf_path = os.path.relpath(pdf_files[key].as_posix(), out_dir.as_posix()) if key in pdf_files else ""
                 text_path = os.path.relpath(text_files[key].as_posix(), out_dir.as_posix()) if key in text_files else ""
+                if store is not None and not text_path:
+                    text_path = store.ref(nhood, key)  # "packed/<NHOOD>.jsonl.gz#<NOTICE>"
                 
                 # Write to CSV
                 writer.writerow([addr, typ, date_notice, notice_num, district, neighborhood, pdf_path, text_path])
                 csv_file.flush(); os.fsync(csv_file.fileno())
+                await emit("row_written", address=addr, type=typ, date_notice=date_notice, notice_number=notice_num,
+                           district=district, neighborhood=neighborhood, pdf_path=pdf_path, text_path=text_path,
+                           address_normalized=normalize_address(addr), property_key=property_key(addr))
                 
                 # Write to database if connection available
                 if db_conn and notice_num:
                     # Convert paths to URLs (relative to /violations/)
                     pdf_url = f"/violations/{pdf_path.replace(os.sep, '/')}" if pdf_path else None
-                    text_url = f"/violations/{text_path.replace(os.sep, '/')}" if text_path else None
+                    # a packed ref ("shard#notice") isn't servable: the fragment never reaches the server
+                    text_url = f"/violations/{text_path.replace(os.sep, '/')}" if text_path and "#" not in text_path else None
                     
                     violation = {
                         'notice_number': notice_num,
@@ -578,21 +773,39 @@ async def run(all_neighborhoods: bool,
                         'neighborhood': neighborhood,
                         'date_notice': date_notice,
                         'pdf_url': pdf_url,
-                        'text_url': text_url
+                        'text_url': text_url,
+                        'address_normalized': normalize_address(addr) or None,
+                        'property_key': property_key(addr) or None
                     }
                     upsert_violation(db_conn, violation)
                 
                 if key: existing_notices.add(key)
 
-            await page.wait_for_timeout(300)
+            await emit("neighborhood_done", neighborhood=nhood, ok=True, rows=len(filtered), downloaded=downloaded)
+
+        async def worker(page, queue: asyncio.Queue):
+            while True:
+                try: nhood = queue.get_nowait()
+                except asyncio.QueueEmpty: return
+                await scrape_neighborhood(page, nhood)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for nhood in targets: queue.put_nowait(nhood)
+        n_workers = max(1, min(workers, len(targets)))
+        # one context per worker: separate session cookie, so separate server-side results state
+        pages = [page] + [await new_page(await new_browser_context(browser)) for _ in range(n_workers - 1)]
+        if n_workers > 1: print(f"[info] Scraping {len(targets)} neighborhoods with {n_workers} workers")
+        await asyncio.gather(*(worker(pg, queue) for pg in pages))
 
         await browser.close()
     
     csv_file.close()
+    for t in warmups: await t
     if db_conn:
         db_conn.close()
         print("[info] Database connection closed")
     print(f"\nDone. CSV: {csv_path}")
+    await emit("run_done", ok=True, csv=str(csv_path))
 
 if __name__ == "__main__":
     import argparse, re
@@ -604,14 +817,33 @@ if __name__ == "__main__":
     parser.add_argument("--since", type=str, default=None, help="Only include rows on/after this ISO date YYYY-MM-DD.")
     parser.add_argument("--headed", action="store_true", help="Run with a visible browser window (for debugging).")
     parser.add_argument("--max-pdfs-per-neighborhood", type=int, default=None, help="Limit PDF downloads per neighborhood (debug).")
-    parser.add_argument("--slow-mo", type=int, default=0, help="Extra ms delay between page actions (debug).")
+    parser.add_argument("--slow-mo", type=int, default=0, help="Extra ms delay after each navigation and between rows (debug / pacing).")
     parser.add_argument("--extract", action="store_true", help="Also extract text and JSON for each PDF.")
     parser.add_argument("--ocr", action="store_true", help="When no text layer, try OCR (needs Tesseract installed).")
     parser.add_argument("--skip-existing", action="store_true", help="Skip rows whose PDF already exists (resume).")
     parser.add_argument("--force-extract", action="store_true", help="Rebuild text/json even if they exist.")
-    parser.add_argument("--row-timeout", type=int, default=45, help="Per-row watchdog in seconds (prevents hangs).")
+    parser.add_argument("--row-timeout", type=int, default=None, help="Per-row watchdog in seconds (prevents hangs; default 45).")
+    parser.add_argument("--workers", type=int, default=None, help="Neighborhoods scraped concurrently, one page each (default 1).")
+    parser.add_argument("--tune-from", type=Path, default=None,
+                        help="Probe report from test_site_connectivity.py --probe; sets step timeouts, and --row-timeout/--workers unless given.")
+    parser.add_argument("--store", choices=["files", "packed"], default="files",
+                        help="Where --extract output goes: per-notice .txt/.json files, or compressed shards under <out>/packed/.")
+    parser.add_argument("--packed-codec", choices=["gzip", "zstd"], default="gzip", help="Compression for --store packed (zstd needs 'zstandard').")
+    parser.add_argument("--emit", choices=["text", "ndjson"], default="text",
+                        help="ndjson: write one structured event per row/stage (see event_stream.py).")
+    parser.add_argument("--emit-to", default="-", help="Where --emit ndjson events go: '-' for stdout, or a file/named pipe.")
     args = parser.parse_args()
 
+    if args.emit == "ndjson":
+        event_stream.start(args.emit_to)
+        # stdout belongs to the event stream; human-readable [info]/[row] lines move to stderr
+        if args.emit_to == "-": sys.stdout = sys.stderr
+
+    tuned = {}
+    if args.tune_from:
+        try: tuned = apply_probe_report(args.tune_from)
+        except Exception as e: print(f"[warn] Could not read probe report {args.tune_from}: {e}")
+
     try:
         asyncio.run(run(
             all_neighborhoods=args.all,
@@ -625,7 +857,12 @@ if __name__ == "__main__":
             do_ocr=args.ocr,
             skip_existing=args.skip_existing,
             force_extract=args.force_extract,
-            row_timeout_sec=args.row_timeout,
+            row_timeout_sec=args.row_timeout or tuned.get("row_timeout_sec") or 45,
+            workers=args.workers or tuned.get("workers") or 1,
+            store_kind=args.store,
+            packed_codec=args.packed_codec,
         ))
     except KeyboardInterrupt:
         print("\n[warn] Stopped by user. CSV may be partial but is flushed.")
+    finally:
+        event_stream.stop()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the scraper CLI, based on `python -X importtime`.
+Each scenario runs in a fresh interpreter; the heaviest top-level imports are listed.
+
+Usage:
+  python bench_import_time.py                 # 5 runs per scenario, top 10 modules
+  python bench_import_time.py --runs 10 --top 20
+
+Scenarios:
+  scraper   import baltimore_violations_scraper (the download-only startup path)
+  extras    the same plus psycopg2, pdfplumber, ocrmypdf (what --extract/--ocr/DB_URL add)
+"""
+import argparse, statistics, subprocess, sys
+from collections import defaultdict
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+SCENARIOS = {
+    "scraper": "import baltimore_violations_scraper",
+    "extras": "import baltimore_violations_scraper as s; [s._optional_import(m) for m in ('psycopg2','pdfplumber','ocrmypdf')]",
+}
+
+def importtime(code: str):
+    """Return ({top-level module: cumulative us}, total us) for one fresh interpreter."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=HERE, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f"[error] {code!r} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    mods = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line: continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.startswith("  "): continue  # nested import, already counted in its parent
+        mods[name.strip()] = int(cumulative)
+    return mods, sum(mods.values())
+
+def main():
+    ap = argparse.ArgumentParser(description="Measure scraper module import time with -X importtime.")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=10)
+    a = ap.parse_args()
+
+    for label, code in SCENARIOS.items():
+        totals, per_mod = [], defaultdict(list)
+        for _ in range(a.runs):
+            mods, total = importtime(code)
+            totals.append(total)
+            for m, us in mods.items(): per_mod[m].append(us)
+        print(f"\n=== {label}: median {statistics.median(totals)/1000:.1f} ms "
+              f"(min {min(totals)/1000:.1f}, max {max(totals)/1000:.1f}) over {a.runs} runs ===")
+        ranked = sorted(per_mod.items(), key=lambda kv: statistics.median(kv[1]), reverse=True)
+        for m, us in ranked[:a.top]:
+            print(f"  {statistics.median(us)/1000:8.1f} ms  {m}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Per-row latency benchmark against a local mock of the results page.
+Serves a results table + PDFs from a throwaway HTTP server and times
+download_all_pdfs_for_results() row by row (no load on the real site).
+
+Usage:
+  python bench_row_latency.py                       # 20 rows, popup links
+  python bench_row_latency.py --rows 50 --mode download --delay-ms 150
+  python bench_row_latency.py --mode navigate --headed
+  python bench_row_latency.py --compare             # current vs. --baseline on the same mock
+
+--baseline swaps in the pre-event-driven PDF helpers (copied below from the
+original scraper) and the fixed 500 ms pause after every row.
+
+Modes:
+  popup     <a target=_blank> to an inline PDF (new tab)
+  download  link served with Content-Disposition: attachment
+  navigate  plain <a href> to an inline PDF (same tab)
+"""
+import argparse, asyncio, statistics, tempfile, threading, time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from playwright.async_api import async_playwright, TimeoutError as PWTimeout
+
+import baltimore_violations_scraper as scraper
+from baltimore_violations_scraper import download_all_pdfs_for_results, extract_rows_on_results
+
+# ---------- baseline: PDF helpers as they were before the event-driven waits ----------
+async def _legacy_save_pdf_via_popup(context, page, click_callable, dest_path: Path) -> bool:
+    try:
+        async with context.expect_page(timeout=15000) as pinfo:
+            await click_callable()
+        new_page = await pinfo.value
+        resp = await scraper._wait_pdf_response(new_page)
+        if resp:
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            dest_path.write_bytes(await resp.body())
+            await new_page.close()
+            return True
+        for _ in range(40):  # poll new_page.url every 0.5 s
+            url = new_page.url or ""
+            if url.startswith(("http://","https://")):
+                try:
+                    r = await context.request.get(url, timeout=25000)
+                    if "pdf" in (r.headers or {}).get("content-type","").lower() or url.lower().endswith(".pdf"):
+                        dest_path.parent.mkdir(parents=True, exist_ok=True)
+                        dest_path.write_bytes(await r.body())
+                        await new_page.close()
+                        return True
+                except Exception:
+                    pass
+                break
+            await asyncio.sleep(0.5)
+        await new_page.close()
+        return False
+    except PWTimeout:
+        return False
+
+async def _legacy_save_pdf_via_download(page, click_callable, dest_path: Path) -> bool:
+    try:
+        async with page.expect_download(timeout=15000) as dl_info:
+            await click_callable()
+        download = await dl_info.value
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        await download.save_as(dest_path.as_posix())
+        return True
+    except PWTimeout:
+        return False
+
+async def _legacy_save_pdf_via_navigation(context, page, click_callable, dest_path: Path) -> bool:
+    try:
+        async with page.expect_navigation(timeout=20000):
+            await click_callable()
+    except PWTimeout:
+        return False
+    url = page.url or ""
+    ok = False
+    if url.startswith(("http://","https://")):
+        try:
+            r = await context.request.get(url, timeout=25000)
+            if "pdf" in (r.headers or {}).get("content-type","").lower() or url.lower().endswith(".pdf"):
+                dest_path.parent.mkdir(parents=True, exist_ok=True)
+                dest_path.write_bytes(await r.body())
+                ok = True
+        except Exception:
+            pass
+    try: await page.go_back(timeout=8000)
+    except Exception: pass
+    return ok
+
+LEGACY_ROW_PAUSE_MS = 500
+
+@contextmanager
+def legacy_helpers(enabled: bool):
+    names = ("_save_pdf_via_popup", "_save_pdf_via_download", "_save_pdf_via_navigation")
+    saved = {n: getattr(scraper, n) for n in names}
+    if enabled:
+        for n in names: setattr(scraper, n, globals()["_legacy" + n])
+    try:
+        yield
+    finally:
+        for n, f in saved.items(): setattr(scraper, n, f)
+
+PDF_BYTES = (b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+             b"2 0 obj<</Type/Pages/Kids[]/Count 0>>endobj\ntrailer<</Root 1 0 R>>\n%%EOF\n")
+
+def make_handler(n_rows: int, mode: str, delay_ms: int):
+    target = ' target="_blank"' if mode == "popup" else ""
+    body_rows = "".join(
+        f"<tr><td>{100+i} MOCK ST</td><td>Violation</td><td>01/02/2025</td><td>{9000000+i}A</td>"
+        f"<td>Central</td><td>MOCK</td><td><a href=\"/pdf/{9000000+i}A.pdf\"{target}>View</a></td></tr>"
+        for i in range(n_rows)
+    )
+    results_html = (
+        "<html><body><table><tr><td>Record Count: %d</td></tr></table>"
+        "<table><tr><th>Address</th><th>Type</th><th>Date</th><th>Notice</th><th>District</th>"
+        "<th>Neighborhood</th><th>PDF</th></tr>%s</table></body></html>" % (n_rows, body_rows)
+    ).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *a): pass
+
+        def do_GET(self):
+            if delay_ms: time.sleep(delay_ms / 1000)
+            if self.path.startswith("/pdf/"):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/pdf")
+                if mode == "download":
+                    self.send_header("Content-Disposition", f'attachment; filename="{Path(self.path).name}"')
+                self.send_header("Content-Length", str(len(PDF_BYTES)))
+                self.end_headers(); self.wfile.write(PDF_BYTES)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(results_html)))
+            self.end_headers(); self.wfile.write(results_html)
+    return Handler
+
+async def bench(rows: int, mode: str, delay_ms: int, headless: bool, row_timeout: int, baseline: bool = False) -> dict:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(rows, mode, delay_ms))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/TL_On_Map.aspx"
+    timings = []
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=headless)
+            context = await browser.new_context(accept_downloads=True)
+            page = await context.new_page()
+            await page.goto(url, wait_until="domcontentloaded")
+            parsed = await extract_rows_on_results(page)
+            with tempfile.TemporaryDirectory() as tmp, legacy_helpers(baseline):
+                t0 = time.perf_counter()
+                got = await download_all_pdfs_for_results(page, Path(tmp), parsed,
+                                                          row_timeout_sec=row_timeout, timings=timings,
+                                                          row_pause_ms=LEGACY_ROW_PAUSE_MS if baseline else 0)
+                wall = time.perf_counter() - t0
+            await browser.close()
+    finally:
+        server.shutdown()
+
+    # per-row = wall / rows, so the baseline's between-row pause is counted (row timings exclude it)
+    res = {"label": "baseline" if baseline else "current", "downloaded": got, "wall": wall,
+           "per_row": wall / len(timings) if timings else 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    if timings:
+        q = statistics.quantiles(timings, n=20) if len(timings) >= 2 else timings * 19
+        res.update(p50=statistics.median(timings), p95=q[18], max=max(timings))
+    print("\n" + "=" * 60)
+    print(f"[{res['label']}] mode={mode} rows={rows} delay_ms={delay_ms} downloaded={got}")
+    if not timings: print("no rows timed")
+    else:
+        print(f"wall={wall:.2f}s  per-row={res['per_row']:.3f}s  click-path p50={res['p50']:.3f}s  "
+              f"p95={res['p95']:.3f}s  max={res['max']:.3f}s")
+    print("=" * 60)
+    return res
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Benchmark per-row PDF latency against a local mock results page.")
+    ap.add_argument("--rows", type=int, default=20)
+    ap.add_argument("--mode", choices=["popup", "download", "navigate"], default="popup")
+    ap.add_argument("--delay-ms", type=int, default=0, help="Artificial server latency per request.")
+    ap.add_argument("--row-timeout", type=int, default=45)
+    ap.add_argument("--headed", action="store_true")
+    g = ap.add_mutually_exclusive_group()
+    g.add_argument("--baseline", action="store_true", help="Run the old fixed-sleep / polling behaviour.")
+    g.add_argument("--compare", action="store_true", help="Run current and baseline, then print the difference.")
+    a = ap.parse_args()
+    if a.rows < 1: ap.error("--rows must be at least 1")
+    if not a.compare:
+        asyncio.run(bench(a.rows, a.mode, a.delay_ms, not a.headed, a.row_timeout, baseline=a.baseline))
+    else:
+        cur = asyncio.run(bench(a.rows, a.mode, a.delay_ms, not a.headed, a.row_timeout))
+        old = asyncio.run(bench(a.rows, a.mode, a.delay_ms, not a.headed, a.row_timeout, baseline=True))
+        print(f"\nper-row: baseline {old['per_row']:.3f}s -> current {cur['per_row']:.3f}s "
+              f"({(1 - cur['per_row'] / old['per_row']) * 100 if old['per_row'] else 0:.0f}% lower)")
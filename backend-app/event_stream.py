@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Structured NDJSON progress events for `--emit ndjson`.
+
+One JSON object per line, always with "event" and "ts" (ISO-8601 UTC):
+  run_start, neighborhood_start, rows_listed, row_listed, row_skipped,
+  pdf_saved, pdf_failed, extracted, row_written, neighborhood_done, run_done
+
+Lines are handed to a writer thread through a bounded queue. When the consumer
+stops reading, the pipe fills, the writer thread blocks, the queue fills and
+emit() starts awaiting, so the scraper slows to the consumer's pace instead of
+buffering without bound or blocking the event loop (and with it Playwright).
+"""
+import asyncio, json, queue, sys, threading
+from datetime import datetime, timezone
+from typing import Optional, TextIO
+
+_STOP = object()
+
+class EventEmitter:
+    def __init__(self, target: str = "-", max_pending: int = 1000):
+        # "-" = stdout; anything else is opened for writing (a file or a named pipe)
+        self._out: TextIO = sys.stdout if target == "-" else open(target, "w", encoding="utf-8", buffering=1)
+        self._owns_out = target != "-"
+        self._q: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._drain, name="ndjson-writer", daemon=True)
+        self._thread.start()
+
+    def _drain(self):
+        while True:
+            line = self._q.get()
+            if line is _STOP: break
+            try:
+                self._out.write(line)
+                if self._q.empty(): self._out.flush()
+            except (BrokenPipeError, ValueError):
+                # consumer went away; keep draining so producers never block forever
+                continue
+
+    async def emit(self, event: str, **fields):
+        line = json.dumps({"event": event, "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"), **fields},
+                          ensure_ascii=False, default=str) + "\n"
+        try:
+            self._q.put_nowait(line)
+        except queue.Full:
+            await asyncio.to_thread(self._q.put, line)
+
+    def close(self):
+        self._q.put(_STOP)
+        self._thread.join()
+        try:
+            self._out.flush()
+            if self._owns_out: self._out.close()
+        except (BrokenPipeError, ValueError):
+            pass
+
+_emitter: Optional[EventEmitter] = None
+
+def start(target: str = "-") -> EventEmitter:
+    global _emitter
+    _emitter = EventEmitter(target)
+    return _emitter
+
+async def emit(event: str, **fields):
+    """No-op unless start() was called (i.e. the scraper runs with --emit ndjson)."""
+    if _emitter is not None:
+        await _emitter.emit(event, **fields)
+
+def stop():
+    global _emitter
+    if _emitter is not None:
+        _emitter.close()
+        _emitter = None
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Packed storage for extracted notices: one compressed JSONL shard per neighborhood
+instead of a .txt + .json pair per notice.
+
+Layout under <out>/packed/:
+  <NEIGHBORHOOD>.jsonl.gz     records, each an independent gzip member (or zstd frame: .jsonl.zst)
+  <NEIGHBORHOOD>.idx          one line per record: notice_number \\t offset \\t length
+
+Because every record is compressed on its own, a record can be read back by seeking
+to its offset (random access by notice number), and the shard is still a valid
+multi-member gzip/zstd stream for plain tools (zcat, zstdcat). Appends are data first,
+index second, so a crash can at worst leave an unindexed tail that is ignored.
+Later appends for the same notice win; the superseded records stay in the shard
+(--force-extract re-appends) until `compact` rewrites it with the latest record per notice.
+
+A record is referenced from the CSV / DB as "packed/<shard file>#<NOTICE>"
+(see PackedStore.ref); `get` accepts such a reference as well as a bare notice number.
+
+Usage:
+  python packed_store.py <root_dir> get <NOTICE|REF> [NEIGHBORHOOD]
+  python packed_store.py <root_dir> scan [NEIGHBORHOOD]      # JSONL to stdout
+  python packed_store.py <root_dir> compact [NEIGHBORHOOD]   # drop superseded records (not during a scrape)
+"""
+import gzip, json, os, sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+@lru_cache(maxsize=None)
+def _zstandard():
+    # optional and only needed for zstd shards; imported on first use to keep scraper startup light
+    try:
+        import zstandard
+        return zstandard
+    except Exception:
+        return None
+
+CODEC_SUFFIX = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+def _shard_name(nhood: str) -> str:
+    return nhood.replace("/", "-")
+
+class PackedStore:
+    def __init__(self, root: Path, codec: str = "gzip"):
+        if codec not in CODEC_SUFFIX:
+            raise ValueError(f"Unknown codec {codec!r}; expected one of {sorted(CODEC_SUFFIX)}")
+        if codec == "zstd" and _zstandard() is None:
+            raise RuntimeError("codec 'zstd' needs the 'zstandard' package (pip install zstandard)")
+        self.root = Path(root) / "packed"
+        self.codec = codec
+        self._indexes: Dict[str, Dict[str, Tuple[int, int]]] = {}
+
+    # ---------- paths / codec ----------
+    def _shard_path(self, nhood: str) -> Path:
+        # reading picks up whichever codec the shard was written with
+        for suffix in CODEC_SUFFIX.values():
+            p = self.root / (_shard_name(nhood) + suffix)
+            if p.exists(): return p
+        return self.root / (_shard_name(nhood) + CODEC_SUFFIX[self.codec])
+
+    def _index_path(self, nhood: str) -> Path:
+        return self.root / (_shard_name(nhood) + ".idx")
+
+    def ref(self, nhood: str, notice: str) -> str:
+        """Reference to a stored record, relative to the output root ("" if not stored)."""
+        key = (notice or "").strip().upper()
+        if key not in self._index(nhood): return ""
+        return f"{self.root.name}/{self._shard_path(nhood).name}#{key}"
+
+    @staticmethod
+    def _compress(path: Path, data: bytes) -> bytes:
+        # follow the existing shard's codec so one file never mixes formats
+        if path.name.endswith(".zst"):
+            zstandard = _zstandard()
+            if zstandard is None:
+                raise RuntimeError(f"{path} is zstd-compressed; install the 'zstandard' package")
+            return zstandard.ZstdCompressor(level=9).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    @staticmethod
+    def _decompress(path: Path, blob: bytes) -> bytes:
+        if path.name.endswith(".zst"):
+            zstandard = _zstandard()
+            if zstandard is None:
+                raise RuntimeError(f"{path} is zstd-compressed; install the 'zstandard' package")
+            return zstandard.ZstdDecompressor().decompress(blob)
+        return gzip.decompress(blob)
+
+    # ---------- index ----------
+    def _index(self, nhood: str) -> Dict[str, Tuple[int, int]]:
+        key = _shard_name(nhood)
+        if key not in self._indexes:
+            idx: Dict[str, Tuple[int, int]] = {}
+            ip = self._index_path(nhood)
+            if ip.exists():
+                with open(ip, "r", encoding="utf-8") as f:
+                    for line in f:
+                        parts = line.rstrip("\n").split("\t")
+                        if len(parts) != 3: continue
+                        try: idx[parts[0].upper()] = (int(parts[1]), int(parts[2]))
+                        except ValueError: continue
+            self._indexes[key] = idx
+        return self._indexes[key]
+
+    def neighborhoods(self):
+        if not self.root.exists(): return []
+        return sorted(p.stem for p in self.root.glob("*.idx"))
+
+    # ---------- write ----------
+    def append(self, nhood: str, record: dict) -> None:
+        notice = (record.get("notice_number") or "").strip().upper()
+        if not notice: raise ValueError("record needs a notice_number")
+        self.root.mkdir(parents=True, exist_ok=True)
+        shard = self._shard_path(nhood)
+        blob = self._compress(shard, (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+        with open(shard, "ab") as f:
+            offset = f.seek(0, 2)
+            f.write(blob)
+        with open(self._index_path(nhood), "a", encoding="utf-8") as f:
+            f.write(f"{notice}\t{offset}\t{len(blob)}\n")
+        self._index(nhood)[notice] = (offset, len(blob))
+
+    # ---------- read ----------
+    def has(self, nhood: str, notice: str) -> bool:
+        return (notice or "").strip().upper() in self._index(nhood)
+
+    def get(self, notice: str, nhood: Optional[str] = None) -> Optional[dict]:
+        """Random access by notice number or ref(); searches every shard when nhood is not given."""
+        if "#" in (notice or ""):
+            shard_file, notice = notice.rsplit("#", 1)
+            if not nhood:
+                nhood = Path(shard_file).name
+                for suffix in CODEC_SUFFIX.values(): nhood = nhood.removesuffix(suffix)
+        key = (notice or "").strip().upper()
+        for n in ([nhood] if nhood else self.neighborhoods()):
+            loc = self._index(n).get(key)
+            if loc is None: continue
+            shard = self._shard_path(n)
+            with open(shard, "rb") as f:
+                f.seek(loc[0])
+                return json.loads(self._decompress(shard, f.read(loc[1])))
+        return None
+
+    def scan(self, nhood: Optional[str] = None) -> Iterator[dict]:
+        """Stream the latest record per notice, shard by shard, in file order."""
+        for n in ([nhood] if nhood else self.neighborhoods()):
+            idx = self._index(n)
+            if not idx: continue
+            shard = self._shard_path(n)
+            with open(shard, "rb") as f:
+                for offset, length in sorted(idx.values()):
+                    f.seek(offset)
+                    try:
+                        yield json.loads(self._decompress(shard, f.read(length)))
+                    except Exception:
+                        continue
+
+    # ---------- maintenance ----------
+    def compact(self, nhood: Optional[str] = None) -> Tuple[int, int]:
+        """Rewrite shards with only the latest record per notice; returns (bytes before, bytes after).
+
+        The new shard and index are written next to the old ones and swapped in with
+        os.replace, shard first; run it while no scrape is appending to the store."""
+        before = after = 0
+        for n in ([nhood] if nhood else self.neighborhoods()):
+            idx = self._index(n)
+            shard = self._shard_path(n)
+            if not idx or not shard.exists(): continue
+            size = shard.stat().st_size
+            new_shard = shard.with_name(shard.name + ".tmp")
+            new_index = self._index_path(n).with_name(self._index_path(n).name + ".tmp")
+            new_idx: Dict[str, Tuple[int, int]] = {}
+            # records are copied still compressed; each one is a standalone member/frame
+            with open(shard, "rb") as src, open(new_shard, "wb") as dst, open(new_index, "w", encoding="utf-8") as ix:
+                for notice, (offset, length) in sorted(idx.items(), key=lambda kv: kv[1]):
+                    src.seek(offset)
+                    blob = src.read(length)
+                    new_idx[notice] = (dst.tell(), len(blob))
+                    dst.write(blob)
+                    ix.write(f"{notice}\t{new_idx[notice][0]}\t{len(blob)}\n")
+            os.replace(new_shard, shard)
+            os.replace(new_index, self._index_path(n))
+            self._indexes[_shard_name(n)] = new_idx
+            before += size; after += shard.stat().st_size
+        return before, after
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[2] not in ("get", "scan", "compact"):
+        print(__doc__.strip().split("Usage:")[-1]); sys.exit(2)
+    store = PackedStore(Path(sys.argv[1]))
+    if sys.argv[2] == "get":
+        rec = store.get(sys.argv[3], sys.argv[4] if len(sys.argv) > 4 else None)
+        if rec is None: print(f"[warn] {sys.argv[3]} not found"); sys.exit(1)
+        print(json.dumps(rec, ensure_ascii=False, indent=2))
+    elif sys.argv[2] == "compact":
+        before, after = store.compact(sys.argv[3] if len(sys.argv) > 3 else None)
+        print(f"[ok] compacted {before} -> {after} bytes")
+    else:
+        for rec in store.scan(sys.argv[3] if len(sys.argv) > 3 else None):
+            sys.stdout.write(json.dumps(rec, ensure_ascii=False) + "\n")
@@ -2,31 +2,52 @@
 
 #!/usr/bin/env python3
 """
-Rebuild data/violations.csv from existing per-notice JSON files.
+Rebuild data/violations.csv from existing per-notice JSON files and/or the
+packed shards written by `--store packed` (data/packed/, see packed_store.py).
+Also rebuilds data/properties.sqlite: every notice with its normalized address and
+property key (address_norm.py) and ISO notice date, indexed by property_key, plus a
+repeat_offenders view.
 Usage:
   python rebuild_csv_from_json.py  [root_dir]   # default: ./data
 """
-import csv, json, sys
+import csv, itertools, json, sqlite3, sys
 from pathlib import Path
 
+from address_norm import normalize_address, property_key
+from baltimore_violations_scraper import parse_date
+from packed_store import PackedStore
+
 root = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("data")
 json_root = root / "json"
 text_root = root / "text"
 csv_path  = root / "violations.csv"
+db_path   = root / "properties.sqlite"
 
-rows = []
-for j in json_root.rglob("*.json"):
-    try:
-        payload = json.loads(j.read_text(encoding="utf-8"))
-    except Exception:
-        continue
+def json_payloads():
+    for j in json_root.rglob("*.json"):
+        try:
+            yield json.loads(j.read_text(encoding="utf-8"))
+        except Exception:
+            continue
 
+rows = []
+notices = []
+seen = set()
+# packed records come last: a notice already rebuilt from a JSON file is not repeated
+store = PackedStore(root)
+for payload in itertools.chain(json_payloads(), store.scan()):
     row = payload.get("row", {}) or {}
     nhood = payload.get("neighborhood") or ""
     source_pdf = payload.get("source_pdf") or ""
     text_path = ""
 
-    if source_pdf:
+    packed = "text" in payload
+    key = (row.get("notice_number") or payload.get("notice_number") or "").strip().upper()
+    if packed and key in seen: continue
+    if key: seen.add(key)
+    if packed: text_path = store.ref(nhood, key)
+
+    if source_pdf and not packed:
         try:
             pdf_name = Path(source_pdf).name
             cand = (text_root / nhood / (Path(pdf_name).stem + ".txt"))
@@ -35,6 +56,12 @@ for j in json_root.rglob("*.json"):
         except Exception:
             pass
 
+    addr = row.get("address","")
+    if key:
+        notices.append((row.get("notice_number",""), row.get("property_key") or property_key(addr),
+                        row.get("address_normalized") or normalize_address(addr), addr,
+                        row.get("neighborhood_cell","") or nhood, parse_date(row.get("date_notice",""))))
+
     rows.append([
         row.get("address",""),
         row.get("type",""),
@@ -53,3 +80,27 @@ with open(csv_path, "w", newline="", encoding="utf-8") as f:
     w.writerows(rows)
 
 print(f"[ok] Wrote {csv_path} with {len(rows)} rows")
+
+tmp_db = db_path.with_suffix(".sqlite.tmp")
+tmp_db.unlink(missing_ok=True)
+con = sqlite3.connect(tmp_db)
+con.executescript("""
+    CREATE TABLE notices (
+        notice_number TEXT PRIMARY KEY,
+        property_key TEXT,
+        address_normalized TEXT,
+        address TEXT,
+        neighborhood TEXT,
+        date_notice TEXT  -- ISO YYYY-MM-DD, so MIN/MAX order by date
+    );
+    CREATE INDEX ix_notices_property_key ON notices (property_key);
+    CREATE VIEW repeat_offenders AS
+        SELECT property_key, MIN(address_normalized) AS address_normalized,
+               COUNT(*) AS notices, MIN(date_notice) AS first_notice, MAX(date_notice) AS last_notice
+          FROM notices WHERE property_key != ''
+         GROUP BY property_key HAVING COUNT(*) > 1;
+""")
+con.executemany("INSERT OR REPLACE INTO notices VALUES (?,?,?,?,?,?)", notices)
+con.commit(); con.close()
+tmp_db.replace(db_path)
+print(f"[ok] Wrote {db_path} with {len(notices)} notices")
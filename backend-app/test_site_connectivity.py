@@ -2,8 +2,19 @@
 """
 Quick test script to verify Baltimore Housing site connectivity and PDF accessibility.
 Run this to diagnose timeout issues before running the full scraper.
+
+Probe mode repeats search -> results -> PDF cycles and reports per-step latency
+percentiles, error rates and recommended scraper settings as JSON. With --concurrency C > 1
+a serial pass runs first, and the recommended worker count comes from how much throughput
+actually grows from 1 to C cycles in flight (each cycle gets its own browser context,
+i.e. its own server session):
+  python test_site_connectivity.py --probe 20 --concurrency 2 --json probe.json
+  python baltimore_violations_scraper.py --tune-from probe.json --neighborhoods ABELL
 """
-import asyncio
+import argparse, asyncio, contextlib, json, math, statistics, sys, tempfile, time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
 from playwright.async_api import async_playwright
 
 SEARCH_URL = "https://cels.baltimorehousing.org/Search_On_Map.aspx"
@@ -113,7 +124,165 @@ async def test_site_connectivity():
         print("\nNext step: Try running the scraper with --headed flag to watch it in action")
         print("="*60)
 
+# ---------- probe / benchmark mode ----------
+PROBE_STEPS = ("search", "results", "pdf")
+# which scraper STEP_BUDGET_MS entries each probe step informs
+BUDGET_KEYS = {
+    "search": ("goto", "form"),
+    "results": ("results",),
+    "pdf": ("download", "popup", "pdf_response", "popup_url", "navigate", "fetch", "restore"),
+}
+
+def _clamp(v, lo, hi): return max(lo, min(hi, v))
+
+def _percentiles(ms):
+    if not ms: return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    q = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+    return {"p50_ms": round(q[49]), "p95_ms": round(q[94]), "p99_ms": round(q[98]), "max_ms": round(max(ms))}
+
+async def _probe_cycle(context, neighborhood: str, row_timeout_sec: int) -> dict:
+    # imported here so the plain connectivity check works without the scraper module
+    from baltimore_violations_scraper import (download_all_pdfs_for_results, extract_rows_on_results,
+                                              get_neighborhood_controls, submit_search_for_neighborhood)
+    out, step = {}, "search"
+    page = await context.new_page()
+    try:
+        t0 = time.perf_counter()
+        await page.goto(SEARCH_URL, wait_until="domcontentloaded", timeout=60000)
+        await get_neighborhood_controls(page)
+        out["search"] = (time.perf_counter() - t0) * 1000
+
+        step, t0 = "results", time.perf_counter()
+        await submit_search_for_neighborhood(page, neighborhood)
+        rows = await extract_rows_on_results(page)
+        out["results"] = (time.perf_counter() - t0) * 1000
+        if not rows: raise RuntimeError(f"no result rows for {neighborhood}")
+
+        step, t0 = "pdf", time.perf_counter()
+        with tempfile.TemporaryDirectory() as tmp:
+            got = await download_all_pdfs_for_results(page, Path(tmp), rows[:3], max_pdfs=1, max_rows=3,
+                                                      row_timeout_sec=row_timeout_sec)
+        if not got: raise RuntimeError("no PDF saved from the first rows")
+        out["pdf"] = (time.perf_counter() - t0) * 1000
+    except Exception as e:
+        out["error"] = {"step": step, "error": f"{type(e).__name__}: {e}"[:300]}
+    finally:
+        await page.close()
+    return out
+
+def _recommend_workers(concurrency: int, speedup: Optional[float], worst_err: float) -> int:
+    """Workers = the parallelism the site actually delivered between the serial and concurrent pass.
+
+    speedup is throughput(C) / throughput(1); a site that serializes requests gives ~1.0
+    and gets 1 worker no matter how high C was. Without a serial pass (C == 1) there is
+    nothing to scale from, so 1. Halved when the concurrent pass saw more than 2% errors.
+    """
+    if concurrency <= 1 or not speedup: return 1
+    workers = int(_clamp(math.floor(speedup + 0.25), 1, concurrency))
+    return workers if worst_err <= 0.02 else max(1, workers // 2)
+
+def _recommend(steps: dict, concurrency: int, speedup: Optional[float] = None) -> dict:
+    """Budgets at ~3x observed p99 (bounded), row watchdog from PDF p99, workers from measured scaling."""
+    budgets = {}
+    for step, keys in BUDGET_KEYS.items():
+        p99 = steps[step]["p99_ms"]
+        if p99 is None: continue
+        for k in keys: budgets[k] = int(_clamp(3 * p99, 5000, 120000))
+    pdf_p99 = steps["pdf"]["p99_ms"]
+    row_timeout = math.ceil(_clamp(5 * pdf_p99, 10000, 180000) / 1000) if pdf_p99 else None
+    worst_err = max(s["error_rate"] for s in steps.values())
+    workers = _recommend_workers(concurrency, speedup, worst_err)
+    return {"step_budget_ms": budgets, "row_timeout_sec": row_timeout, "workers": workers}
+
+def _summarize(results: list) -> dict:
+    steps = {}
+    for step in PROBE_STEPS:
+        ms = [r[step] for r in results if step in r]
+        # a cycle "attempted" a step if it got that far (succeeded or failed on it)
+        failed = sum(1 for r in results if r.get("error", {}).get("step") == step)
+        attempted = len(ms) + failed
+        steps[step] = {"n": attempted, "ok": len(ms), "errors": failed,
+                       "error_rate": round(failed / attempted, 4) if attempted else 0.0, **_percentiles(ms)}
+    return steps
+
+async def _run_cycles(browser, cycles: int, concurrency: int, neighborhood: str, row_timeout_sec: int, label: str):
+    from baltimore_violations_scraper import new_browser_context
+    results = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with sem:
+            # a context per cycle: concurrent cycles in one context would share the ASP.NET
+            # session, which the server serializes (and whose results state they'd trample)
+            context = await new_browser_context(browser)
+            try: r = await _probe_cycle(context, neighborhood, row_timeout_sec)
+            finally: await context.close()
+            print(f"[probe] {label} cycle {i+1}/{cycles} " + (f"error at {r['error']['step']}" if "error" in r else "ok"), file=sys.stderr)
+            results.append(r)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(cycles)))
+    wall = time.perf_counter() - t0
+    ok = sum(1 for r in results if "error" not in r)
+    return results, wall, (ok / wall * 60 if wall else None)
+
+async def probe_site(cycles: int, concurrency: int, neighborhood: str, headless: bool = True,
+                     row_timeout_sec: int = 45) -> dict:
+    serial = None
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless, args=["--disable-blink-features=AutomationControlled"])
+        if concurrency > 1:
+            # serial reference: enough cycles for a stable mean, fewer than the concurrent pass
+            n = max(3, cycles // concurrency)
+            s_results, s_wall, s_tput = await _run_cycles(browser, n, 1, neighborhood, row_timeout_sec, "serial")
+            s_steps = _summarize(s_results)
+            serial = {"cycles": n, "ok_cycles": sum(1 for r in s_results if "error" not in r),
+                      "wall_sec": round(s_wall, 2), "throughput_cycles_per_min": round(s_tput, 2) if s_tput else None,
+                      "p95_ms": {k: v["p95_ms"] for k, v in s_steps.items()}}
+        results, wall, tput = await _run_cycles(browser, cycles, concurrency, neighborhood, row_timeout_sec,
+                                                f"c={concurrency}")
+        await browser.close()
+
+    steps = _summarize(results)
+    speedup = round(tput / serial["throughput_cycles_per_min"], 2) if serial and tput and serial["throughput_cycles_per_min"] else None
+    return {
+        "probed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": SEARCH_URL,
+        "neighborhood": neighborhood,
+        "cycles": cycles,
+        "concurrency": concurrency,
+        "ok_cycles": sum(1 for r in results if "error" not in r),
+        "wall_sec": round(wall, 2),
+        "throughput_cycles_per_min": round(tput, 2) if tput else None,
+        "steps": steps,
+        "serial": serial,
+        "speedup_vs_serial": speedup,
+        "errors": [r["error"] for r in results if "error" in r][:10],
+        "recommended": _recommend(steps, concurrency, speedup),
+    }
+
 if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Check site connectivity, or probe latency/throughput with --probe N.")
+    ap.add_argument("--probe", type=int, default=0, metavar="N", help="Run N search/results/PDF cycles and report JSON.")
+    ap.add_argument("--concurrency", type=int, default=1,
+                    help="Probe cycles in flight at once; > 1 also runs a serial pass to measure scaling.")
+    ap.add_argument("--neighborhood", default="ABELL", help="Neighborhood searched by each probe cycle.")
+    ap.add_argument("--json", type=Path, default=None, help="Write the probe report here instead of stdout.")
+    ap.add_argument("--headed", action="store_true")
+    args = ap.parse_args()
+
+    if args.probe:
+        # stdout carries the JSON report; scraper [row] chatter goes to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            report = asyncio.run(probe_site(args.probe, max(1, args.concurrency), args.neighborhood, not args.headed))
+        text = json.dumps(report, indent=2)
+        if args.json:
+            args.json.write_text(text, encoding="utf-8")
+            print(f"[ok] Wrote {args.json}", file=sys.stderr)
+        else:
+            print(text)
+        sys.exit(0 if report["ok_cycles"] else 1)
+
     try:
         asyncio.run(test_site_connectivity())
     except KeyboardInterrupt:
@@ -0,0 +1,40 @@
+import pytest
+
+from address_norm import normalize_address, property_key
+
+CASES = [
+    ("1203 North Charles Street, Apt. 2B", "1203 N CHARLES ST UNIT 2B"),
+    ("1203 N. CHARLES ST #2b",             "1203 N CHARLES ST UNIT 2B"),
+    ("1200 North Avenue",                  "1200 NORTH AVE"),
+    ("2001 E NORTH AVE",                   "2001 E NORTH AVE"),
+    ("3400 PARK HEIGHTS AVENUE",           "3400 PARK HEIGHTS AVE"),
+    ("100 MAIN STREET NORTHWEST",          "100 MAIN ST NW"),
+    ("2800 SAINT PAUL STREET",             "2800 ST PAUL ST"),
+    ("1203-1205 W. Pratt Street",          "1203-1205 W PRATT ST"),
+    ("10 Light St Rear",                   "10 LIGHT ST UNIT REAR"),
+    ("100 N Front St",                     "100 N FRONT ST"),
+    ("300 Front Street",                   "300 FRONT ST"),
+    ("12 Upper Park Ave",                  "12 UPPER PARK AVE"),
+    ("300 Front St Rear",                  "300 FRONT ST UNIT REAR"),
+    ("10 NO NAME ST",                      "10 NO NAME ST"),
+    ("12 Main St No 3",                    "12 MAIN ST UNIT 3"),
+    ("5 Elm St Unit 1-A",                  "5 ELM ST UNIT 1A"),
+    ("5 Elm St #1A",                       "5 ELM ST UNIT 1A"),
+    ("5 elm st apt 1 a",                   "5 ELM ST UNIT 1A"),
+    ("123 MAIN ST 2ND FL",                 "123 MAIN ST UNIT 2"),
+    ("123 Main St Floor 2",                "123 MAIN ST UNIT 2"),
+    ("Unknown",                            ""),
+    ("",                                   ""),
+]
+
+@pytest.mark.parametrize("raw,expected", CASES)
+def test_normalize_address(raw, expected):
+    assert normalize_address(raw) == expected
+
+def test_property_key_is_stable_across_spellings():
+    assert property_key("5 Elm St Unit 1-A") == property_key("5 ELM STREET #1A")
+    assert property_key("100 N Front St") == property_key("100 North Front Street")
+    assert len(property_key("5 Elm St")) == 16
+
+def test_no_address_has_no_key():
+    assert property_key("Unknown") == "" and property_key("  ") == ""
@@ -0,0 +1,37 @@
+from packed_store import PackedStore
+
+def test_round_trip_and_latest_record_wins(tmp_path):
+    store = PackedStore(tmp_path)
+    store.append("ST. PAUL/X", {"notice_number": "a1", "v": 1})
+    store.append("ST. PAUL/X", {"notice_number": "b2", "v": 9})
+    store.append("ST. PAUL/X", {"notice_number": "a1", "v": 2})
+
+    ref = store.ref("ST. PAUL/X", "a1")
+    assert ref == "packed/ST. PAUL-X.jsonl.gz#A1"
+    assert store.ref("ST. PAUL/X", "missing") == ""
+
+    # a fresh store reads the index back from disk
+    reread = PackedStore(tmp_path)
+    assert reread.has("ST. PAUL/X", "A1")
+    assert reread.get("a1")["v"] == 2
+    assert reread.get(ref)["v"] == 2
+    assert reread.get("b2", "ST. PAUL/X")["v"] == 9
+    assert reread.get("nope") is None
+    assert sorted((r["notice_number"], r["v"]) for r in reread.scan()) == [("a1", 2), ("b2", 9)]
+
+def test_compact_drops_superseded_records(tmp_path):
+    store = PackedStore(tmp_path)
+    for v in range(3):
+        store.append("ABELL", {"notice_number": "a1", "v": v})
+    store.append("ABELL", {"notice_number": "b2", "v": 9})
+
+    before, after = store.compact()
+    assert after < before
+    idx_lines = (tmp_path / "packed" / "ABELL.idx").read_text(encoding="utf-8").splitlines()
+    assert len(idx_lines) == 2
+
+    reread = PackedStore(tmp_path)
+    assert reread.get("a1")["v"] == 2 and reread.get("b2")["v"] == 9
+    # appends after compaction land on the rewritten shard
+    reread.append("ABELL", {"notice_number": "c3", "v": 5})
+    assert PackedStore(tmp_path).get("c3")["v"] == 5
@@ -0,0 +1,3 @@
+ALTER TABLE "violations" ADD COLUMN "address_normalized" text;--> statement-breakpoint
+ALTER TABLE "violations" ADD COLUMN "property_key" text;--> statement-breakpoint
+CREATE INDEX "violations_property_key_idx" ON "violations" USING btree ("property_key");
\ No newline at end of file
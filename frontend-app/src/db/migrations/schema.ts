@@ -117,6 +117,8 @@ export const verificationTokens = pgTable(
 /**
  * Violations — single source of truth for scraped records.
  * - Natural key = notice_number (unique), we also index by neighborhood & date.
+ * - propertyKey = hash of the normalized address (backend-app/address_norm.py);
+ *   indexed so per-property lookups / repeat-offender counts are equality queries.
  * - pdfUrl/textUrl are stable URLs (local nginx alias or Spaces/S3).
  */
 export const violations = pgTable(
@@ -134,6 +136,9 @@ export const violations = pgTable(
     pdfUrl: text("pdf_url"),
     textUrl: text("text_url"),
 
+    addressNormalized: text("address_normalized"),
+    propertyKey: text("property_key"),
+
     createdAt: timestamp("created_at", { withTimezone: true, mode: "date" })
       .defaultNow()
       .notNull(),
@@ -145,6 +150,7 @@ export const violations = pgTable(
     // With PK on noticeNumber we don't also need a unique constraint.
     index("violations_neighborhood_idx").on(t.neighborhood),
     index("violations_date_neighborhood_idx").on(t.dateNotice, t.neighborhood),
+    index("violations_property_key_idx").on(t.propertyKey),
   ]
 );
 
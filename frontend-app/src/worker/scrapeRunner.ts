@@ -21,13 +21,16 @@
  *   SCRAPER_SKIP_EXISTING=0|1        # pass --skip-existing
  *   SCRAPER_FORCE_EXTRACT=0|1        # pass --force-extract
  *   SCRAPER_MAX_PDFS=1               # override payload maxPdfsPerNeighborhood if set
+ *   SCRAPER_EMIT=ndjson              # pass --emit ndjson and bulk-upsert rows from the event stream
+ *   SCRAPER_INGEST_BATCH=200         # rows per bulk upsert in ndjson mode
+ *   SCRAPER_TUNE_FROM=/path/probe.json  # pass --tune-from (test_site_connectivity.py --probe output)
  */
 import { config as loadEnv } from "dotenv";
 loadEnv({ path: ".env.local" });
 
 import { db } from "@db/config/configureClient";
 import { sql, eq } from "drizzle-orm";
-import { scrapeRequests } from "@db/migrations/schema";
+import { scrapeRequests, violations } from "@db/migrations/schema";
 import { tryLock, unlock } from "@db/locks";
 import { getSinceDateForNeighborhood } from "@db/incremental";
 
@@ -50,6 +53,112 @@ const PER_NHOOD_TIMEOUT_MS = Number(
 );
 const HEARTBEAT_INTERVAL_MS = 5000; // 5 seconds
 const POLL_INTERVAL_MS = 3000; // 3 seconds between job checks
+const EMIT_NDJSON = process.env.SCRAPER_EMIT === "ndjson";
+const INGEST_BATCH = Number(process.env.SCRAPER_INGEST_BATCH || 200);
+const INGEST_FLUSH_MS = 2000; // flush a partial batch at least this often
+
+type ScrapeEvent = { event: string; ts: string; [k: string]: any };
+
+/**
+ * Bulk-upserts `row_written` events from the scraper's NDJSON stream.
+ * Backpressure: while a batch is being written and the buffer is over
+ * INGEST_BATCH, the child's stdout is paused; the OS pipe then fills and the
+ * scraper blocks on its bounded event queue until we catch up.
+ * A failed batch is logged and counted; close() reports it so the caller can
+ * fail the attempt (the scraper has no DB_URL in this mode and won't retry it).
+ */
+function createRowIngest(
+  stdout: NodeJS.ReadableStream,
+  logStream: fs.WriteStream
+) {
+  let buf: ScrapeEvent[] = [];
+  let flushing: Promise<void> = Promise.resolve();
+  let ingested = 0;
+  let failed = 0;
+  const errors: string[] = [];
+
+  async function upsert(batch: ScrapeEvent[]) {
+    // one multi-row upsert can't touch the same notice twice; keep the last event per notice
+    const latest = new Map<string, ScrapeEvent>();
+    for (const e of batch) {
+      if (e.notice_number) latest.set(String(e.notice_number), e);
+    }
+    const values = [...latest.values()]
+      .filter((e) => e.notice_number && !isNaN(new Date(e.date_notice).getTime()))
+      .map((e) => ({
+        noticeNumber: String(e.notice_number),
+        address: e.address || "Unknown",
+        type: e.type || "Unknown",
+        district: e.district || null,
+        neighborhood: e.neighborhood,
+        dateNotice: new Date(e.date_notice),
+        pdfUrl: e.pdf_path ? `/violations/${e.pdf_path.replace(/\\/g, "/")}` : null,
+        // packed refs ("packed/<NHOOD>.jsonl.gz#<NOTICE>") can't be served: the fragment never reaches the route
+        textUrl: e.text_path && !e.text_path.includes("#") ? `/violations/${e.text_path.replace(/\\/g, "/")}` : null,
+        addressNormalized: e.address_normalized || null,
+        propertyKey: e.property_key || null,
+        updatedAt: new Date(),
+      }));
+    if (!values.length) return 0;
+    await db
+      .insert(violations)
+      .values(values)
+      .onConflictDoUpdate({
+        target: violations.noticeNumber,
+        set: {
+          address: sql`excluded.address`,
+          type: sql`excluded.type`,
+          district: sql`excluded.district`,
+          neighborhood: sql`excluded.neighborhood`,
+          dateNotice: sql`excluded.date_notice`,
+          pdfUrl: sql`excluded.pdf_url`,
+          textUrl: sql`excluded.text_url`,
+          addressNormalized: sql`excluded.address_normalized`,
+          propertyKey: sql`excluded.property_key`,
+          updatedAt: sql`now()`,
+        },
+      });
+    return values.length;
+  }
+
+  function flush() {
+    if (!buf.length) return flushing;
+    const batch = buf;
+    buf = [];
+    stdout.pause();
+    flushing = flushing
+      .then(() => upsert(batch))
+      .then((n) => {
+        ingested += n;
+      })
+      .catch((err) => {
+        failed += batch.length;
+        const msg = err instanceof Error ? err.message : String(err);
+        errors.push(msg);
+        console.error("[worker] bulk upsert failed:", err);
+        logStream.write(
+          `[worker] bulk upsert of ${batch.length} row(s) failed: ${msg}\n`
+        );
+      })
+      .finally(() => stdout.resume());
+    return flushing;
+  }
+
+  const timer = setInterval(flush, INGEST_FLUSH_MS);
+
+  return {
+    push(e: ScrapeEvent) {
+      if (e.event !== "row_written") return;
+      buf.push(e);
+      if (buf.length >= INGEST_BATCH) flush();
+    },
+    async close() {
+      clearInterval(timer);
+      await flush();
+      return { ingested, failed, errors };
+    },
+  };
+}
 
 function ensurePaths() {
   if (!fs.existsSync(SCRAPER))
@@ -83,7 +192,9 @@ function runPython(
   const logStream = fs.createWriteStream(logFile, { flags: "a" });
 
   const backendDir = path.resolve(SCRAPER, "..");
-  const env = { ...process.env, PYTHONUNBUFFERED: "1" };
+  const env: NodeJS.ProcessEnv = { ...process.env, PYTHONUNBUFFERED: "1" };
+  // in ndjson mode rows are bulk-upserted here, so the scraper skips its per-row upserts
+  if (EMIT_NDJSON) delete env.DB_URL;
 
   const argv = (PY_VERSION ? [PY_VERSION, SCRAPER] : [SCRAPER]).concat(args);
 
@@ -98,13 +209,32 @@ function runPython(
     stdio: ["ignore", "pipe", "pipe"],
   });
 
-  child.stdout.on("data", (b) => {
-    const s = b.toString();
-    process.stdout.write(s);
-    logStream.write(s);
+  // decode as a stream: the scraper writes raw UTF-8 (ensure_ascii=False) and a
+  // multi-byte character can straddle two chunks
+  child.stdout.setEncoding("utf8");
+  child.stderr.setEncoding("utf8");
+
+  const ingest = EMIT_NDJSON ? createRowIngest(child.stdout, logStream) : null;
+  let pending = "";
+  child.stdout.on("data", (s: string) => {
+    if (!ingest) {
+      process.stdout.write(s);
+      logStream.write(s);
+      return;
+    }
+    // stdout is the event stream; human-readable lines arrive on stderr
+    const lines = (pending + s).split("\n");
+    pending = lines.pop() ?? "";
+    for (const line of lines) {
+      if (!line.trim()) continue;
+      try {
+        ingest.push(JSON.parse(line));
+      } catch {
+        logStream.write(`[worker] bad event line: ${line}\n`);
+      }
+    }
   });
-  child.stderr.on("data", (b) => {
-    const s = b.toString();
+  child.stderr.on("data", (s: string) => {
     process.stderr.write(s);
     logStream.write(s);
   });
@@ -120,9 +250,24 @@ function runPython(
   }, timeoutMs);
 
   return new Promise<{ code: number; logFile: string }>((resolve) => {
-    child.on("close", (code) => {
+    child.on("close", async (code) => {
       clearTimeout(timer);
       if (killed && (code === null || code === 0)) code = 124; // timeout exit code
+      if (ingest) {
+        if (pending.trim()) {
+          try {
+            ingest.push(JSON.parse(pending));
+          } catch {}
+        }
+        const { ingested, failed } = await ingest.close();
+        logStream.write(
+          `[worker] ingested ${ingested} row(s) from event stream` +
+            (failed ? `, ${failed} row(s) FAILED to upsert` : "") +
+            "\n"
+        );
+        // rows that never reached the DB make the attempt fail, so the retry path runs
+        if (failed && code === 0) code = 1;
+      }
       logStream.end();
       resolve({ code: code ?? 1, logFile });
     });
@@ -201,6 +346,9 @@ async function processOneRequest(id: string, payload: any) {
         if (process.env.SCRAPER_HEADED === "1") args.push("--headed");
         const slowMo = Number(process.env.SCRAPER_SLOW_MO || 0);
         if (slowMo > 0) args.push("--slow-mo", String(slowMo));
+        if (EMIT_NDJSON) args.push("--emit", "ndjson");
+        if (process.env.SCRAPER_TUNE_FROM)
+          args.push("--tune-from", process.env.SCRAPER_TUNE_FROM);
 
         let ok = false;
         let attempt = 0;